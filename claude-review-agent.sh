@@ -6,6 +6,10 @@
 # Options:
 #    --skip-claude  ... Set up the repository but don't run claude
 #    --purge-reviews .. Delete all existing review branches and exit
+#    --worktree-base .. Create the review worktree under this directory
+#                       instead of inside the repository; pointing it at a
+#                       tmpfs (e.g. $XDG_RUNTIME_DIR) avoids the checkout
+#                       disk I/O on large repositories
 #
 # Creates a new branch `claude-review-agent/${current-branch}-YYYY-MM-DD-${RAND}`.
 # The new branch contains FIXUP commits with review feedback.
@@ -25,6 +29,7 @@ ORIG_BRANCH=""
 REPODIR="$PWD"
 SKIP_CLAUDE=""
 PURGE=""
+WORKTREE_BASE="."
 
 usage () {
   # Prints anything from the first line that is just '#' to the first empty line
@@ -45,6 +50,10 @@ while [[ $# -gt 0 ]]; do
       PURGE="1"
       shift
       ;;
+    --worktree-base)
+      WORKTREE_BASE="$2"
+      shift 2
+      ;;
     *)
       break;
       ;;
@@ -80,23 +89,28 @@ set -u
 pushd "${REPODIR}" > /dev/null || exit 1
 
 if [[ -n "${PURGE}" ]]; then
-  while IFS= read -r branch; do
-    git branch -D "${branch}"
-  done < <(git branch --format='%(refname:short)' --list "${BRANCH_PREFIX}")
+  mapfile -t branches < <(git for-each-ref --format='%(refname:short)' "refs/heads/${BRANCH_PREFIX}/*")
+  if [[ ${#branches[@]} -gt 0 ]]; then
+    git branch -D "${branches[@]}"
+  fi
   exit 0
 fi
 
 if [[ -z "${ORIG_BRANCH}" ]]; then
   ORIG_BRANCH=$(git rev-parse --abbrev-ref HEAD)
-elif ! git rev-parse "${ORIG_BRANCH}" > /dev/null 2>&1; then
+elif ! git rev-parse --verify --quiet "${ORIG_BRANCH}^{commit}" > /dev/null; then
   echo "Unable to find branch ${ORIG_BRANCH} in this repo"
   exit 1
 fi
 
-RAND=$(uuidgen|cut -d'-' -f1)
-DATE=$(date +"%Y-%m-%d")
+# 32 bits of entropy straight from the shell instead of uuidgen|cut,
+# with a fallback for bash < 5.1 which lacks SRANDOM
+printf -v RAND '%08x' "${SRANDOM:-$((RANDOM * 32768 + RANDOM))}"
+# Bash builtin strftime, saves forking date(1)
+printf -v DATE '%(%Y-%m-%d)T' -1
 BRANCH="${BRANCH_PREFIX}/${ORIG_BRANCH}-${DATE}-${RAND}"
-WORKTREE_DIR="${BRANCH}"
+WORKTREE_ROOT="${WORKTREE_BASE}/${BRANCH_PREFIX}"
+WORKTREE_DIR="${WORKTREE_BASE}/${BRANCH}"
 AGENT_FILE=.claude/agents/code-reviewer.md
 
 GIT_DIR="$PWD"
@@ -106,16 +120,19 @@ git worktree add --quiet -b "${BRANCH}" "${WORKTREE_DIR}" "${ORIG_BRANCH}"
 function cleanup () {
   set +e
   cd "${GIT_DIR}"
-  git worktree remove --force "${WORKTREE_DIR}"
-  rm -r "${BRANCH_PREFIX}"
+  # git deletes the worktree contents itself; only walk the tree
+  # ourselves if it failed and left something behind
+  git worktree remove --force "${WORKTREE_DIR}" || rm -rf "${WORKTREE_DIR}"
+  # Only sweep up the now-empty parent directories; `rm -r` would also
+  # take out any other review worktrees sharing the prefix directory.
+  find "${WORKTREE_ROOT}" -type d -empty -delete 2> /dev/null
   popd > /dev/null || exit 1
 }
 trap cleanup EXIT
 
 cd "${WORKTREE_DIR}"
 
-echo ".gitignore" >> .gitignore
-echo ".claude" >> .gitignore
+printf '.gitignore\n.claude\n' >> .gitignore
 mkdir -p "$(dirname "${AGENT_FILE}")"
 cat <<'EOF' >>"${AGENT_FILE}"
 ---
@@ -243,6 +260,4 @@ ${SKIP_CLAUDE} claude \
   --allowed-tools 'Bash(git status) Bash(git diff:*) Bash(git log:*) Bash(git show:*) Bash(git add:*) Bash(git commit:*) Edit(./**)' \
   -p "Use the code-reviewer subagent to check this branch, add fixup commits and print the number of new commits on the new branch ${BRANCH}."
 
-echo ""
-echo "REVIEW DONE"
-echo "Check out branch ${BRANCH}"
+printf '\nREVIEW DONE\nCheck out branch %s\n' "${BRANCH}"